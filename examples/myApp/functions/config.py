@@ -12,7 +12,7 @@ class Config:
             if cls._instance is None:
                 cls._instance = super(Config, cls).__new__(cls)
                 cls._instance._bad_ratio = 2  # Default bad_ratio value
-                cls._instance._callbacks = []  # Callbacks to notify when bad_ratio changes
+                cls._instance._callbacks = set()  # Callbacks to notify when bad_ratio changes
         return cls._instance
     
     @property
@@ -24,21 +24,24 @@ class Config:
         if not isinstance(value, int) or not (0 <= value <= 10):
             raise ValueError("bad_ratio must be an integer between 0 and 10")
         
-        self._bad_ratio = value
+        with self._lock:
+            self._bad_ratio = value
+            # Snapshot so callbacks may (un)register without breaking iteration
+            callbacks = list(self._callbacks)
         
         # Notify all registered callbacks
-        for callback in self._callbacks:
+        for callback in callbacks:
             callback(value)
     
     def register_callback(self, callback):
         """Register a callback to be notified when bad_ratio changes."""
-        if callback not in self._callbacks:
-            self._callbacks.append(callback)
+        with self._lock:
+            self._callbacks.add(callback)
     
     def unregister_callback(self, callback):
         """Unregister a callback."""
-        if callback in self._callbacks:
-            self._callbacks.remove(callback)
+        with self._lock:
+            self._callbacks.discard(callback)
 
 # Create a global config instance
 config = Config()
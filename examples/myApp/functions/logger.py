@@ -1,16 +1,150 @@
+import atexit
 import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 LOG_FILE = "app.log"
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FORMAT = "%(asctime)s [%(levelname)s] [%(name)s]: %(message)s"
+LOG_QUEUE_MAXSIZE = 10000
+DROP_WARNING_EVERY = 1000
 
-# Configure global logger
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] [%(name)s]: %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of growing without bound.
+
+    If the listener falls behind (slow disk or terminal during a log storm),
+    new records are discarded and counted; producers never block.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The queue never leaves this process, so hand the record over as-is
+        # and let the listener thread do the formatting.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % DROP_WARNING_EVERY == 1:
+                # Logging here would only hit the same full queue.
+                sys.stderr.write(f"Log queue full, {self.dropped} record(s) dropped so far\n")
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that writes through a large buffer.
+
+    emit() neither flushes nor seeks (the stock size check seeks, which
+    flushes the buffer on every record); the log listener calls flush()
+    once the queue drains, so bursts reach disk in a few large writes.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, buffer_size=LOG_BUFFER_SIZE):
+        self._buffer_size = buffer_size
+        self._written = 0
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, delay=True)
+
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self._buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        self._written = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._written and self._written + len(msg) >= self.maxBytes:
+                self.doRollover()
+                self.stream = self._open()
+            self.stream.write(msg)
+            self._written += len(msg)
+        except Exception:
+            self.handleError(record)
+
+
+class _LogListener(QueueListener):
+    def handle(self, record):
+        super().handle(record)
+        # Flush once the backlog is written rather than after every record.
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+    def enqueue_sentinel(self):
+        # Wait for room rather than losing the stop marker on a full queue.
+        self.queue.put(self._sentinel)
+
+
+QUEUE_HANDLER_NAME = "myapp-log-queue"
+
+
+def _install():
+    """Attach the queue handler to the root logger once per process.
+
+    If this module is imported again (a reload, or under a second module
+    name), the existing handler is reused instead of installing a second
+    listener that would duplicate every line.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if handler.name == QUEUE_HANDLER_NAME:
+            return handler.queue, handler
+
+    # File and console writes happen on the listener thread; services only
+    # enqueue records, so a slow disk or terminal never blocks the event loop.
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = BufferedRotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+    )
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.set_name(QUEUE_HANDLER_NAME)
+    listener = _LogListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+
+    # Neither LOG_FORMAT nor the SDK handler uses thread/process fields, so
+    # skip collecting them for every record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    # Configure global logger
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return log_queue, queue_handler
+
+
+_log_queue, _queue_handler = _install()
 
 def get_logger(service_name: str):
     return logging.getLogger(service_name)
+
+def get_log_stats() -> dict:
+    """Return queue depth and drop count for the background log writer."""
+    return {
+        "queued": _log_queue.qsize(),
+        "queue_maxsize": LOG_QUEUE_MAXSIZE,
+        "dropped": _queue_handler.dropped,
+    }
@@ -0,0 +1,35 @@
+"""
+Batched random draws for the simulated services.
+"""
+import random
+
+
+class RandomPool:
+    """Iterator that draws values from a population in batches.
+
+    One rng.choices(population, k=size) call refills the pool, so each
+    next() is a list pop instead of a random.randint/choice call.
+    """
+
+    def __init__(self, population, size: int = 1024, rng: random.Random = random):
+        self._population = population
+        self._size = size
+        self._rng = rng
+        self._values = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._values:
+            self._values = self._rng.choices(self._population, k=self._size)
+        return self._values.pop()
+
+
+def make_ip_pool(size: int = 512, rng: random.Random = random) -> list:
+    """Pre-format `size` random 192.168.x.y client addresses."""
+    octets = range(1, 256)
+    return [
+        f"192.168.{a}.{b}"
+        for a, b in zip(rng.choices(octets, k=size), rng.choices(octets, k=size))
+    ]
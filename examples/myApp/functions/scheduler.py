@@ -0,0 +1,67 @@
+"""
+Drift-free pacing for the simulated services.
+"""
+import asyncio
+import heapq
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+# Delay before retrying a service whose step() raised
+ERROR_RETRY_SECONDS = 5.0
+
+
+class JitterSchedule:
+    """Random intervals in [low, high], drawn ahead of time in batches."""
+
+    def __init__(self, low: float, high: float, size: int = 1024, rng: random.Random = random):
+        self._low = low
+        self._high = high
+        self._size = size
+        self._rng = rng
+        self._delays = []
+
+    def next_delay(self) -> float:
+        if not self._delays:
+            uniform, low, high = self._rng.uniform, self._low, self._high
+            self._delays = [uniform(low, high) for _ in range(self._size)]
+        return self._delays.pop()
+
+
+class LogScheduler:
+    """Runs the step() of several services from a single timer.
+
+    Each service's step() emits one tick of logs and returns the delay before
+    its next tick. Deadlines live in a heap on the event loop's monotonic
+    clock, so one coroutine and one pending timer serve every service, and
+    time spent logging does not push a service's schedule back. A service
+    that falls more than an interval behind restarts from now instead of
+    bursting to catch up. A step() that raises is logged and retried after
+    ERROR_RETRY_SECONDS, so one failing service does not stop the others.
+    """
+
+    def __init__(self, services):
+        self._services = list(services)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        heap = [(now, index, service) for index, service in enumerate(self._services)]
+        heapq.heapify(heap)
+        while heap:
+            deadline, index, service = heap[0]
+            now = loop.time()
+            if deadline > now:
+                await asyncio.sleep(deadline - now)
+                continue
+            try:
+                next_deadline = deadline + service.step()
+            except Exception:
+                logger.exception(
+                    "%s.step() failed; retrying in %ss", type(service).__name__, ERROR_RETRY_SECONDS
+                )
+                next_deadline = now + ERROR_RETRY_SECONDS
+            if next_deadline < now:
+                next_deadline = now
+            heapq.heapreplace(heap, (next_deadline, index, service))
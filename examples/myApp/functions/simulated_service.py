@@ -0,0 +1,51 @@
+"""
+Base class for the simulated services.
+"""
+import logging
+from abc import ABC, abstractmethod
+
+from .scheduler import JitterSchedule, LogScheduler
+
+
+class SimulatedService(ABC):
+    """Ratio handling, pacing and run loop shared by every simulated service.
+
+    Subclasses set ``display_name`` and ``_logger`` and implement step(),
+    which emits one tick of logs and returns the delay before the next.
+    """
+
+    display_name = "Service"
+    _logger = logging.getLogger(__name__)
+
+    def __init__(self, bad_log_ratio: int = 2):
+        self.bad_log_ratio = bad_log_ratio
+        # Bit i set -> log slot i of every 10 is bad (low bad_log_ratio bits)
+        self._bad_mask = (1 << bad_log_ratio) - 1
+        self._slot = 0  # position within each block of 10 logs
+        self._schedule = JitterSchedule(2, 5)
+        self._logger.info(f"{self.display_name} initialized with bad_log_ratio: {bad_log_ratio}")
+
+    def set_bad_ratio(self, ratio: int):
+        """Update the bad log ratio for this service"""
+        if not isinstance(ratio, int) or not (0 <= ratio <= 10):
+            self._logger.error(f"Invalid bad_log_ratio: {ratio}, must be between 0-10")
+            return
+        self._logger.info(f"Updating {self.display_name} bad_log_ratio: {self.bad_log_ratio} -> {ratio}")
+        self.bad_log_ratio = ratio
+        self._bad_mask = (1 << ratio) - 1
+
+    def _next_is_bad(self) -> bool:
+        """Advance to the next log slot and return whether it is a bad one."""
+        slot = self._slot = self._slot + 1 if self._slot < 9 else 0
+        return bool((self._bad_mask >> slot) & 1)
+
+    @abstractmethod
+    def step(self) -> float:
+        """Emit one tick of logs and return the delay before the next."""
+
+    async def run(self):
+        """
+        Simulate this service on its own timer.
+        bad_log_ratio: number of bad logs per 10 logs (0-10)
+        """
+        await LogScheduler([self]).run()
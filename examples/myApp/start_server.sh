@@ -0,0 +1,3 @@
+#!/bin/bash
+# Run the FastAPI app (uvloop ships with uvicorn[standard])
+uvicorn main:app --host 0.0.0.0 --port 8000 --loop uvloop
@@ -12,8 +12,14 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
-# Import main module
-import main
+RATIO_CHOICES = tuple(range(11))
+SERVICE_NAMES = ("api", "auth", "inventory", "notification", "payment")
+
+
+def _main():
+    """Import the app module on first use; it builds and starts every service."""
+    return importlib.import_module("main")
+
 
 def update_ratios(api=None, auth=None, inventory=None, notification=None, payment=None):
     """
@@ -29,42 +35,38 @@ def update_ratios(api=None, auth=None, inventory=None, notification=None, paymen
     Returns:
         dict: Current bad log ratios for all services
     """
-    main.update_service_ratios(
-        api_ratio=api,
-        auth_ratio=auth,
-        inventory_ratio=inventory,
-        notification_ratio=notification,
-        payment_ratio=payment
-    )
+    services = _main().SERVICES
+    requested = {
+        "api": api,
+        "auth": auth,
+        "inventory": inventory,
+        "notification": notification,
+        "payment": payment,
+    }
+    for name, ratio in requested.items():
+        if ratio is not None and name in services:
+            services[name].set_bad_ratio(ratio)
     
     # Return current ratios
-    return {
-        "api": main.api_service.bad_log_ratio if main.api_service else None,
-        "auth": main.auth_service.bad_log_ratio if main.auth_service else None,
-        "inventory": main.inventory_service.bad_log_ratio if main.inventory_service else None,
-        "notification": main.notification_service.bad_log_ratio if main.notification_service else None,
-        "payment": main.payment_service.bad_log_ratio if main.payment_service else None
-    }
+    return get_current_ratios()
 
 def get_current_ratios():
     """Get the current bad log ratios for all services."""
+    services = _main().SERVICES
     return {
-        "api": main.api_service.bad_log_ratio if main.api_service else None,
-        "auth": main.auth_service.bad_log_ratio if main.auth_service else None,
-        "inventory": main.inventory_service.bad_log_ratio if main.inventory_service else None,
-        "notification": main.notification_service.bad_log_ratio if main.notification_service else None,
-        "payment": main.payment_service.bad_log_ratio if main.payment_service else None
+        name: services[name].bad_log_ratio if name in services else None
+        for name in SERVICE_NAMES
     }
 
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Update service bad log ratios at runtime")
-    parser.add_argument("--api", type=int, choices=range(0, 11), help="API service bad ratio (0-10)")
-    parser.add_argument("--auth", type=int, choices=range(0, 11), help="Auth service bad ratio (0-10)")
-    parser.add_argument("--inventory", type=int, choices=range(0, 11), help="Inventory service bad ratio (0-10)")
-    parser.add_argument("--notification", type=int, choices=range(0, 11), help="Notification service bad ratio (0-10)")
-    parser.add_argument("--payment", type=int, choices=range(0, 11), help="Payment service bad ratio (0-10)")
+    for name in SERVICE_NAMES:
+        label = "API" if name == "api" else name.capitalize()
+        parser.add_argument(
+            f"--{name}", type=int, choices=RATIO_CHOICES, help=f"{label} service bad ratio (0-10)"
+        )
     parser.add_argument("--get", action="store_true", help="Get current ratios without changing them")
     
     args = parser.parse_args()
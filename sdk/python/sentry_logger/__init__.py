@@ -7,11 +7,16 @@ from .local_config import load_local_config
 
 __all__ = ["SentryLogHandler", "SentryLoggerConfig", "init"]
 
+# Handler installed by init(); later calls return it instead of adding another
+_HANDLER: SentryLogHandler | None = None
+
 
 def init(
     api_key: str,
     batch_size: int = 50,
     flush_interval_seconds: float = 5.0,
+    skip_record_context: bool = False,
+    gzip_min_bytes: int = 0,
 ) -> SentryLogHandler:
     """
     Initialize Sentry Logger and add handler to root logger.
@@ -20,9 +25,18 @@ def init(
         api_key: Your LogSentry API key from the dashboard
         batch_size: Number of logs to batch before sending (default: 50)
         flush_interval_seconds: Seconds between automatic flushes (default: 5.0)
+        skip_record_context: Stop the logging module from collecting caller
+            file/line and thread/process info for every record (default: False).
+            This is process-wide, so only enable it if no other handler's
+            format uses those fields.
+        gzip_min_bytes: Gzip batches at least this many bytes (default: 0, off).
+            Requires a backend whose /ingest accepts gzip-encoded bodies.
     
     Returns:
-        SentryLogHandler instance for advanced usage
+        SentryLogHandler instance for advanced usage. Calling init() again
+        returns the handler already attached to the root logger, unless it
+        was removed or its worker has stopped, in which case a new one is
+        installed.
     
     Example:
         >>> import sentry_logger as sentry
@@ -37,15 +51,37 @@ def init(
     """
     import logging
 
+    global _HANDLER
+
     if not api_key:
         raise ValueError("api_key is required. Get it from your LogSentry dashboard.")
 
+    root = logging.getLogger()
+    candidates = [_HANDLER] if _HANDLER is not None else []
+    candidates += [h for h in root.handlers if isinstance(h, SentryLogHandler) and h is not _HANDLER]
+    for existing in candidates:
+        if existing in root.handlers and existing._worker_alive():
+            _HANDLER = existing
+            return existing
+        # Detached by the app, or closed by dictConfig/fork: replace it
+        root.removeHandler(existing)
+        existing.close()
+
     config = SentryLoggerConfig(
         api_key=api_key,
         batch_size=batch_size,
         flush_interval_seconds=flush_interval_seconds,
+        gzip_min_bytes=gzip_min_bytes,
     )
     handler = SentryLogHandler(config)
-    logging.getLogger().addHandler(handler)
-    logging.getLogger().setLevel(logging.INFO)
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    if skip_record_context:
+        # Shipped lines only use asctime, levelname, name and message;
+        # without a source file, findCaller() skips its stack walk.
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+    _HANDLER = handler
     return handler
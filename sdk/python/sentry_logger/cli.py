@@ -1,27 +1,41 @@
 """CLI for one-command SDK onboarding."""
 import argparse
+import email.message
+import io
 import json
 import sys
 import time
 import urllib.error
 import urllib.parse
-import urllib.request
 import webbrowser
 
 from .local_config import get_default_config_path, load_local_config, save_local_config
+from .transport import KeepAliveConnection
+
+
+POLL_INTERVAL_MARGIN = 1.2
+MAX_POLL_INTERVAL_SECONDS = 60
+
+# One keep-alive connection per backend, reused by the device poll loop
+_CONNECTIONS: dict[str, KeepAliveConnection] = {}
 
 
 def _http_json(method: str, url: str, payload: dict | None = None) -> dict:
     data = json.dumps(payload).encode("utf-8") if payload is not None else None
-    request = urllib.request.Request(
-        url,
-        method=method,
-        data=data,
-        headers={"Content-Type": "application/json"},
+    parts = urllib.parse.urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    conn = _CONNECTIONS.get(origin)
+    if conn is None:
+        conn = _CONNECTIONS[origin] = KeepAliveConnection(origin, timeout=15)
+    status, body = conn.request(
+        method, url, body=data, headers={"Content-Type": "application/json"}
     )
-    with urllib.request.urlopen(request, timeout=15) as response:
-        body = response.read().decode("utf-8")
-        return json.loads(body) if body else {}
+    if status >= 400:
+        raise urllib.error.HTTPError(
+            url, status, f"HTTP {status}", email.message.Message(), io.BytesIO(body)
+        )
+    text = body.decode("utf-8")
+    return json.loads(text) if text else {}
 
 
 def cmd_init(args: argparse.Namespace) -> int:
@@ -47,6 +61,10 @@ def cmd_init(args: argparse.Namespace) -> int:
     user_code = start["user_code"]
     device_code = start["device_code"]
     interval = int(start.get("interval", 3))
+    # Poll a little slower than the server's minimum interval, and back off
+    # exponentially while polls fail so an unhealthy backend is not hammered.
+    base_interval = interval * POLL_INTERVAL_MARGIN
+    current_interval = base_interval
 
     print("Open this URL to login and link your app:")
     print(verification_uri_complete)
@@ -55,12 +73,8 @@ def cmd_init(args: argparse.Namespace) -> int:
     if not args.no_browser:
         webbrowser.open(verification_uri_complete)
 
-    started = time.monotonic()
+    deadline = time.monotonic() + args.timeout_seconds
     while True:
-        if (time.monotonic() - started) > args.timeout_seconds:
-            print("Timed out waiting for approval.", file=sys.stderr)
-            return 2
-
         try:
             poll_url = f"{dsn}/sdk/device/poll?{urllib.parse.urlencode({'device_code': device_code})}"
             poll = _http_json("GET", poll_url)
@@ -68,13 +82,14 @@ def cmd_init(args: argparse.Namespace) -> int:
             if exc.code == 400:
                 print("Device code expired. Run init again.", file=sys.stderr)
                 return 2
-            time.sleep(interval)
-            continue
+            poll = None
         except Exception:
-            time.sleep(interval)
-            continue
+            poll = None
 
-        if poll.get("status") == "approved":
+        if poll is None:
+            delay = current_interval
+            current_interval = min(current_interval * 2, MAX_POLL_INTERVAL_SECONDS)
+        elif poll.get("status") == "approved":
             payload = {
                 "app_id": poll["app_id"],
                 "app_name": poll.get("app_name", args.app_name),
@@ -89,8 +104,16 @@ def cmd_init(args: argparse.Namespace) -> int:
             print("  from sentry_logger import init")
             print("  init()  # reads local config")
             return 0
+        else:
+            delay = current_interval = base_interval
 
-        time.sleep(interval)
+        # Never sleep past the deadline, so the timeout is honoured even
+        # when the backoff interval has grown large.
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print("Timed out waiting for approval.", file=sys.stderr)
+            return 2
+        time.sleep(min(delay, remaining))
 
 
 def cmd_status(args: argparse.Namespace) -> int:
@@ -8,6 +8,14 @@ class SentryLoggerConfig:
     api_key: str
     batch_size: int = 50
     flush_interval_seconds: float = 5.0
+    # Flush early once buffered messages reach this many characters
+    max_batch_bytes: int = 64 * 1024
+    # Logs waiting to be sent beyond this are dropped instead of queued
+    max_queue_size: int = 10000
+    # Gzip request bodies at least this large; 0 (the default) sends them
+    # uncompressed. Only enable against a backend whose /ingest accepts
+    # Content-Encoding: gzip, or it will reject the batches.
+    gzip_min_bytes: int = 0
     
     # Internal - URL is set via environment variable
     _backend_url: str | None = None
@@ -1,73 +1,159 @@
 """
 Logging handler that buffers log records and sends them in batches to the Sentry ingest API.
 """
-import atexit
+import gzip
 import json
 import logging
+import os
+import queue
 import threading
 import time
-import urllib.request
 
 from .config import SentryLoggerConfig
+from .transport import KeepAliveConnection
+
+# Queue marker that tells the worker to send what it has and exit
+_STOP = object()
 
 
 class SentryLogHandler(logging.Handler):
     """
     Buffers log records and POSTs them in batches to the Sentry ingest endpoint.
-    Uses a background thread for non-blocking sends.
+    Uses a single background worker thread for non-blocking sends.
     """
 
     def __init__(self, config: SentryLoggerConfig):
         super().__init__()
         self.config = config
-        self._buffer: list[str] = []
-        self._lock = threading.Lock()
-        self._shutdown = False
-        self._last_flush = time.monotonic()
+        self.dropped = 0
+        self._closed = False
+        self._pid: int | None = None
+        self._restart_lock = threading.Lock()
         self.setFormatter(
             logging.Formatter("%(asctime)s [%(levelname)s] [%(name)s]: %(message)s")
         )
-        atexit.register(self.flush)
+        self._start_worker()
+
+    def _start_worker(self) -> None:
+        pid = os.getpid()
+        if pid != self._pid:
+            # First start, or a forked child: the parent's backlog and socket
+            # belong to the parent, so the child starts with its own.
+            # emit() only enqueues; the worker batches by count, size or
+            # flush_interval_seconds. When the queue is full (ingest down or
+            # too slow) new logs are dropped and counted rather than piling up.
+            self._queue: queue.Queue = queue.Queue(maxsize=self.config.max_queue_size)
+            self._enqueue = self._queue.put_nowait
+            # Only the worker sends, so it can keep one connection open
+            self._http = KeepAliveConnection(self.config.ingest_url, timeout=10)
+            self._pid = pid
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="sentry-logger-flush", daemon=True
+        )
+        self._worker.start()
+
+    def _worker_alive(self) -> bool:
+        """Whether this process has a running worker to send queued logs."""
+        return self._pid == os.getpid() and self._worker.is_alive()
+
+    def _revive(self) -> bool:
+        """Restart the worker after close() or in a forked child."""
+        if self._pid != os.getpid():
+            # The lock may have been held by another thread at fork time
+            self._restart_lock = threading.Lock()
+        with self._restart_lock:
+            if self._worker_alive():
+                return True
+            try:
+                self._start_worker()
+            except RuntimeError:
+                # No new threads during interpreter shutdown
+                return False
+            return True
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
-            msg = self.format(record)
-            with self._lock:
-                self._buffer.append(msg)
-                now = time.monotonic()
-                if (
-                    len(self._buffer) >= self.config.batch_size
-                    or (now - self._last_flush) >= self.config.flush_interval_seconds
-                ):
-                    self._flush_locked()
+            # logging.config.dictConfig (run by uvicorn after init()) closes
+            # existing handlers without detaching them, and a fork does not
+            # copy the worker thread; either way, start a new worker.
+            if not self._worker_alive() and not self._revive():
+                self.dropped += 1
+                return
+            self._enqueue(self.format(record))
+        except queue.Full:
+            self.dropped += 1
         except Exception:
             self.handleError(record)
 
-    def _flush_locked(self) -> None:
-        if not self._buffer:
-            return
-        logs = self._buffer[:]
-        self._buffer = []
-        self._last_flush = time.monotonic()
-        threading.Thread(target=self._send, args=(logs,), daemon=True).start()
+    def _run(self) -> None:
+        batch: list[str] = []
+        batch_bytes = 0
+        deadline = time.monotonic() + self.config.flush_interval_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+            if isinstance(item, str):
+                batch.append(item)
+                batch_bytes += len(item)
+                if (
+                    len(batch) < self.config.batch_size
+                    and batch_bytes < self.config.max_batch_bytes
+                ):
+                    continue
+            # Full batch, interval elapsed, flush() request or stop
+            if batch:
+                self._send(batch)
+                batch = []
+                batch_bytes = 0
+            deadline = time.monotonic() + self.config.flush_interval_seconds
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                self._http.close()
+                return
 
     def _send(self, logs: list[str]) -> None:
         try:
-            body = json.dumps({"logs": logs}).encode("utf-8")
-            req = urllib.request.Request(
-                self.config.ingest_url,
-                data=body,
-                method="POST",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.config.api_key}",
-                    "X-API-Key": self.config.api_key,
-                },
-            )
-            urllib.request.urlopen(req, timeout=10)
+            # Compact separators and raw UTF-8 keep the payload small; the
+            # ingest endpoint only accepts JSON, so there is no binary framing.
+            body = json.dumps(
+                {"logs": logs}, separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.config.api_key}",
+                "X-API-Key": self.config.api_key,
+            }
+            # Formatted log lines repeat timestamps and logger names, so even
+            # the fastest level shrinks a batch several times over.
+            if self.config.gzip_min_bytes and len(body) >= self.config.gzip_min_bytes:
+                body = gzip.compress(body, compresslevel=1)
+                headers["Content-Encoding"] = "gzip"
+            self._http.request("POST", self.config.ingest_url, body=body, headers=headers)
         except Exception:
             pass  # Fail silently to avoid disrupting the app
 
-    def flush(self) -> None:
-        with self._lock:
-            self._flush_locked()
+    def flush(self, timeout: float = 10.0) -> None:
+        """Send everything logged so far, waiting up to ``timeout`` seconds."""
+        if self._closed or not self._worker_alive():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            if self._worker_alive():
+                try:
+                    self._queue.put(_STOP, timeout=10)
+                except queue.Full:
+                    pass
+                self._worker.join(timeout=15)
+        super().close()
@@ -4,6 +4,10 @@ import os
 from pathlib import Path
 from typing import Any
 
+# Parsed config files keyed by path -> (mtime_ns, size, payload); an entry is
+# reused until the file's mtime or size changes.
+_CACHE: dict[Path, tuple[int, int, dict[str, Any]]] = {}
+
 
 def get_default_config_path() -> Path:
     home = Path.home()
@@ -16,19 +20,29 @@ def ensure_parent(path: Path) -> None:
 
 def load_local_config(path: str | None = None) -> dict[str, Any]:
     config_path = Path(path) if path else get_default_config_path()
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except OSError:
+        _CACHE.pop(config_path, None)
         return {}
+    cached = _CACHE.get(config_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return dict(cached[2])
     try:
         with config_path.open("r", encoding="utf-8") as f:
             payload = json.load(f)
-        return payload if isinstance(payload, dict) else {}
     except Exception:
         return {}
+    if not isinstance(payload, dict):
+        payload = {}
+    _CACHE[config_path] = (st.st_mtime_ns, st.st_size, payload)
+    return dict(payload)
 
 
 def save_local_config(payload: dict[str, Any], path: str | None = None) -> Path:
     config_path = Path(path) if path else get_default_config_path()
     ensure_parent(config_path)
+    _CACHE.pop(config_path, None)
     with config_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2)
     return config_path
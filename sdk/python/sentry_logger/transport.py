@@ -0,0 +1,98 @@
+"""Keep-alive HTTP connection reused across requests to one backend."""
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# Statuses urllib's redirect handler follows
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+
+class KeepAliveConnection:
+    """
+    Holds one persistent HTTP(S) connection to the host of ``base_url``.
+    Requests reuse it, so repeated sends skip the TCP (and TLS) handshake.
+    Not thread-safe; each thread that sends should own its own instance.
+
+    Requests go through urllib.request.urlopen instead when a proxy applies
+    to the host (HTTP(S)_PROXY / NO_PROXY) or once the backend has answered
+    with a redirect, so proxy support and redirect following still work.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 10):
+        parts = urllib.parse.urlsplit(base_url)
+        self._https = parts.scheme == "https"
+        self._netloc = parts.netloc
+        self._timeout = timeout
+        self._conn: http.client.HTTPConnection | None = None
+        proxies = urllib.request.getproxies()
+        self._use_urlopen = parts.scheme in proxies and not urllib.request.proxy_bypass(
+            parts.hostname or ""
+        )
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._https:
+            return http.client.HTTPSConnection(self._netloc, timeout=self._timeout)
+        return http.client.HTTPConnection(self._netloc, timeout=self._timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, bytes]:
+        """Send a request and return (status, body), including for error statuses."""
+        if self._use_urlopen:
+            return self._urlopen(method, url, body, headers or {})
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        reused = self._conn is not None
+        try:
+            status, data = self._request(method, target, body, headers or {})
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # The server may close an idle keep-alive connection between
+            # requests; retry once on a fresh one.
+            if not reused:
+                raise
+            status, data = self._request(method, target, body, headers or {})
+        if status in _REDIRECT_STATUSES:
+            # Let urllib follow it (e.g. http -> https), now and from here on.
+            self.close()
+            self._use_urlopen = True
+            return self._urlopen(method, url, body, headers or {})
+        return status, data
+
+    def _urlopen(
+        self, method: str, url: str, body: bytes | None, headers: dict[str, str]
+    ) -> tuple[int, bytes]:
+        request = urllib.request.Request(url, data=body, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    def _request(
+        self, method: str, target: str, body: bytes | None, headers: dict[str, str]
+    ) -> tuple[int, bytes]:
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            self._conn.request(method, target, body=body, headers=headers)
+            response = self._conn.getresponse()
+            # Read the body in full so the connection can be reused
+            data = response.read()
+        except Exception:
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        return response.status, data
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
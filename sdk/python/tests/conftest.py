@@ -0,0 +1,84 @@
+import gzip
+import http.server
+import json
+import os
+import sys
+import threading
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class IngestServer:
+    """Local HTTP/1.1 server recording every request it receives."""
+
+    def __init__(self):
+        self.requests = []  # (method, path, headers, body)
+        self.client_ports = set()
+        self.routes = {}  # path -> (status, extra headers, body)
+        self.close_after_response = False
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                server.requests.append((self.command, self.path, dict(self.headers), body))
+                server.client_ports.add(self.client_address[1])
+                status, headers, payload = server.routes.get(
+                    self.path.split("?")[0], (200, {}, b"{}")
+                )
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                if server.close_after_response:
+                    # Drop the connection without announcing it, like an
+                    # idle keep-alive timeout on the server side.
+                    self.close_connection = True
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def logs(self):
+        """Every log line received on /ingest, in arrival order."""
+        lines = []
+        for method, path, headers, body in self.requests:
+            if path != "/ingest":
+                continue
+            if headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            lines.extend(json.loads(body)["logs"])
+        return lines
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def ingest_server():
+    server = IngestServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def no_proxy_env(monkeypatch):
+    for name in ("http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY", "no_proxy", "NO_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    # urlopen() caches an opener built from the proxy env on first use
+    monkeypatch.setattr(urllib.request, "_opener", None)
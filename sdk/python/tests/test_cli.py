@@ -0,0 +1,45 @@
+import json
+import sys
+import time
+
+from sentry_logger import cli
+
+
+def test_init_poll_stops_at_timeout(ingest_server, monkeypatch, tmp_path, capsys):
+    ingest_server.routes["/sdk/device/start"] = (
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps(
+            {
+                "verification_uri_complete": "http://example.invalid/device",
+                "user_code": "ABCD",
+                "device_code": "dev-1",
+                "interval": 30,
+            }
+        ).encode(),
+    )
+    ingest_server.routes["/sdk/device/poll"] = (200, {}, b'{"status": "pending"}')
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "sentry-logger",
+            "init",
+            "--app-name",
+            "demo",
+            "--no-browser",
+            "--dsn",
+            ingest_server.url,
+            "--timeout-seconds",
+            "1",
+            "--config-path",
+            str(tmp_path / "config.json"),
+        ],
+    )
+
+    started = time.monotonic()
+    assert cli.main() == 2
+    # The 36s poll interval is cut short at the 1s deadline
+    assert time.monotonic() - started < 5
+    assert "Timed out waiting for approval." in capsys.readouterr().err
+    assert not (tmp_path / "config.json").exists()
@@ -0,0 +1,106 @@
+import json
+import logging
+import logging.config
+import os
+
+import pytest
+
+from sentry_logger import SentryLogHandler, SentryLoggerConfig
+
+
+@pytest.fixture
+def make_handler(ingest_server):
+    handlers = []
+
+    def make(**overrides):
+        config = SentryLoggerConfig(
+            api_key="sk_test",
+            flush_interval_seconds=60,
+            _backend_url=ingest_server.url,
+            **overrides,
+        )
+        handler = SentryLogHandler(config)
+        handlers.append(handler)
+        return handler
+
+    yield make
+    for handler in handlers:
+        handler.close()
+
+
+@pytest.fixture
+def test_logger():
+    logger = logging.getLogger("sentry_logger.tests")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    yield logger
+    logger.handlers.clear()
+
+
+def test_handler_keeps_sending_after_dict_config(ingest_server, make_handler, test_logger):
+    handler = make_handler()
+    test_logger.addHandler(handler)
+
+    # uvicorn.run() does this after sentry_logger.init(); it closes every
+    # existing handler but leaves them attached.
+    logging.config.dictConfig(
+        {"version": 1, "disable_existing_loggers": False, "loggers": {"uvicorn": {"level": "INFO"}}}
+    )
+    for i in range(10):
+        test_logger.info("after dictConfig %d", i)
+    handler.flush()
+
+    assert [line.rsplit(": ", 1)[1] for line in ingest_server.logs()] == [
+        f"after dictConfig {i}" for i in range(10)
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_handler_sends_from_forked_child(ingest_server, make_handler, test_logger):
+    handler = make_handler()
+    test_logger.addHandler(handler)
+    test_logger.info("parent before fork")
+    handler.flush()
+
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            for i in range(3):
+                test_logger.info("child %d", i)
+            handler.flush()
+            status = 0
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    test_logger.info("parent after fork")
+    handler.flush()
+
+    messages = [line.rsplit(": ", 1)[1] for line in ingest_server.logs()]
+    assert messages.count("parent before fork") == 1
+    assert sorted(m for m in messages if m.startswith("child")) == ["child 0", "child 1", "child 2"]
+    assert "parent after fork" in messages
+
+
+def test_handler_sends_uncompressed_by_default(ingest_server, make_handler, test_logger):
+    handler = make_handler()
+    test_logger.addHandler(handler)
+    test_logger.info("plain")
+    handler.flush()
+
+    [(_, _, headers, body)] = ingest_server.requests
+    assert "Content-Encoding" not in headers
+    assert json.loads(body)["logs"][0].endswith(": plain")
+
+
+def test_handler_gzips_batches_when_enabled(ingest_server, make_handler, test_logger):
+    handler = make_handler(gzip_min_bytes=1)
+    test_logger.addHandler(handler)
+    test_logger.info("compressed")
+    handler.flush()
+
+    [(_, _, headers, _)] = ingest_server.requests
+    assert headers["Content-Encoding"] == "gzip"
+    assert ingest_server.logs()[0].endswith(": compressed")
@@ -0,0 +1,54 @@
+import logging
+import logging.config
+
+import pytest
+
+import sentry_logger
+
+
+@pytest.fixture
+def clean_root(ingest_server, monkeypatch):
+    monkeypatch.setenv("LOGSENTRY_URL", ingest_server.url)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    monkeypatch.setattr(sentry_logger, "_HANDLER", None)
+    yield root
+    for handler in root.handlers:
+        if isinstance(handler, sentry_logger.SentryLogHandler):
+            handler.close()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def _sentry_handlers(root):
+    return [h for h in root.handlers if isinstance(h, sentry_logger.SentryLogHandler)]
+
+
+def test_init_returns_same_handler(clean_root):
+    handler = sentry_logger.init(api_key="sk_test")
+
+    assert sentry_logger.init(api_key="sk_test") is handler
+    assert _sentry_handlers(clean_root) == [handler]
+
+
+def test_init_replaces_handler_removed_from_root(clean_root):
+    first = sentry_logger.init(api_key="sk_test")
+    clean_root.removeHandler(first)
+
+    second = sentry_logger.init(api_key="sk_test")
+
+    assert second is not first
+    assert _sentry_handlers(clean_root) == [second]
+
+
+def test_init_replaces_handler_closed_by_dict_config(clean_root, ingest_server):
+    first = sentry_logger.init(api_key="sk_test")
+    logging.config.dictConfig({"version": 1, "disable_existing_loggers": False})
+
+    second = sentry_logger.init(api_key="sk_test")
+    logging.getLogger("init_test").info("after reinit")
+    second.flush()
+
+    assert second is not first
+    assert _sentry_handlers(clean_root) == [second]
+    assert [line.rsplit(": ", 1)[1] for line in ingest_server.logs()] == ["after reinit"]
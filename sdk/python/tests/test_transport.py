@@ -0,0 +1,80 @@
+import pytest
+
+from conftest import IngestServer
+from sentry_logger.transport import KeepAliveConnection
+
+
+@pytest.fixture
+def proxy_server():
+    server = IngestServer()
+    yield server
+    server.stop()
+
+
+def test_reuses_one_connection(ingest_server):
+    conn = KeepAliveConnection(ingest_server.url)
+    try:
+        for _ in range(3):
+            assert conn.request("POST", f"{ingest_server.url}/ingest", body=b"{}") == (200, b"{}")
+    finally:
+        conn.close()
+
+    assert len(ingest_server.requests) == 3
+    assert len(ingest_server.client_ports) == 1
+
+
+def test_retries_after_server_closes_connection(ingest_server):
+    ingest_server.close_after_response = True
+    conn = KeepAliveConnection(ingest_server.url)
+    try:
+        for _ in range(3):
+            assert conn.request("POST", f"{ingest_server.url}/ingest", body=b"{}") == (200, b"{}")
+    finally:
+        conn.close()
+
+    assert len(ingest_server.requests) == 3
+    assert len(ingest_server.client_ports) == 3
+
+
+def test_follows_redirect_with_urlopen(ingest_server):
+    ingest_server.routes["/old"] = (301, {"Location": "/new"}, b"")
+    ingest_server.routes["/new"] = (200, {}, b"moved")
+    conn = KeepAliveConnection(ingest_server.url)
+    try:
+        assert conn.request("GET", f"{ingest_server.url}/old") == (200, b"moved")
+        assert conn.request("GET", f"{ingest_server.url}/new") == (200, b"moved")
+    finally:
+        conn.close()
+
+    # The redirected request is resent through urllib, as is everything after it
+    assert [path for _, path, _, _ in ingest_server.requests] == ["/old", "/old", "/new", "/new"]
+    assert [headers.get("Connection") for _, _, headers, _ in ingest_server.requests[1:]] == [
+        "close"
+    ] * 3
+
+
+def test_sends_through_proxy_with_urlopen(ingest_server, proxy_server, monkeypatch):
+    monkeypatch.setenv("http_proxy", proxy_server.url)
+    conn = KeepAliveConnection(ingest_server.url)
+    try:
+        assert conn.request("POST", f"{ingest_server.url}/ingest", body=b"{}") == (200, b"{}")
+    finally:
+        conn.close()
+
+    assert ingest_server.requests == []
+    assert [path for _, path, _, _ in proxy_server.requests] == [f"{ingest_server.url}/ingest"]
+
+
+def test_no_proxy_bypasses_proxy(ingest_server, proxy_server, monkeypatch):
+    monkeypatch.setenv("http_proxy", proxy_server.url)
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    conn = KeepAliveConnection(ingest_server.url)
+    try:
+        for _ in range(2):
+            assert conn.request("POST", f"{ingest_server.url}/ingest", body=b"{}") == (200, b"{}")
+    finally:
+        conn.close()
+
+    assert proxy_server.requests == []
+    assert len(ingest_server.requests) == 2
+    assert len(ingest_server.client_ports) == 1
@@ -0,0 +1,38 @@
+"""Route class that accepts gzip-compressed request bodies (SDK log batches)."""
+import zlib
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+# Upper bound on a decompressed body, so a small gzip bomb cannot exhaust memory
+MAX_DECOMPRESSED_BYTES = 32 * 1024 * 1024
+
+
+class GzipRequest(Request):
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            if "gzip" in self.headers.get("content-encoding", "").lower():
+                # wbits=31 expects a gzip header and trailer
+                decompressor = zlib.decompressobj(wbits=31)
+                try:
+                    body = decompressor.decompress(body, MAX_DECOMPRESSED_BYTES)
+                except zlib.error:
+                    raise HTTPException(status_code=400, detail="Invalid gzip body")
+                if decompressor.unconsumed_tail:
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            self._body = body
+        return self._body
+
+
+class GzipRoute(APIRoute):
+    """APIRoute whose handler sees the decompressed body when Content-Encoding is gzip."""
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def gzip_route_handler(request: Request) -> Response:
+            return await original_route_handler(GzipRequest(request.scope, request.receive))
+
+        return gzip_route_handler
@@ -1,16 +1,27 @@
-from fastapi import FastAPI, Depends, HTTPException, Header, Query
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+import asyncio
 import os
 import json
+import orjson
 import ssl
 import smtplib
+import time
 import urllib.request
 import urllib.parse
 from email.message import EmailMessage
 from datetime import datetime, timezone
 from typing import List, Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 from app.models.smart_log_processor import process_and_summarize_stream
 from app.core.api_key import (
     complete_device_session,
@@ -23,8 +34,9 @@ from app.core.api_key import (
     validate_sdk_schema,
     _get_supabase,
 )
+from app.core.gzip_request import GzipRoute
 
-app = FastAPI(title="Smart Log Processor API")
+app = FastAPI(title="Smart Log Processor API", default_response_class=ORJSONResponse)
 
 # CORS — allow frontend origins
 ALLOWED_ORIGINS = [
@@ -40,14 +52,21 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let preflights answer from precomputed headers instead
+    # of echoing whatever the browser requested.
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization", "X-API-Key"],
 )
+# Dashboard summaries and notification lists compress well; tiny replies
+# such as /health are not worth the gzip overhead.
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
 RISK_ALERT_WEBHOOK_URL = os.environ.get("RISK_ALERT_WEBHOOK_URL", "").strip()
+RISK_ALERT_WEBHOOK_TIMEOUT_SECONDS = float(os.environ.get("RISK_ALERT_WEBHOOK_TIMEOUT_SECONDS", "5"))
 NOTIFICATION_COOLDOWN_SECONDS = int(os.environ.get("NOTIFICATION_COOLDOWN_SECONDS", "300"))
 NOTIFICATION_STATE_FILE = "notification_state.json"
 NOTIFICATION_EVENTS_FILE = "notification_events.json"
+INGEST_LOCK_FILE = ".ingest.lock"
 
 EMAIL_ALERT_FROM = os.environ.get("EMAIL_ALERT_FROM", "").strip()
 EMAIL_ALERT_TO = [addr.strip() for addr in os.environ.get("EMAIL_ALERT_TO", "").split(",") if addr.strip()]
@@ -56,10 +75,12 @@ SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
 SMTP_USERNAME = os.environ.get("SMTP_USERNAME", "").strip()
 SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "").strip()
 SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "true").lower() in {"1", "true", "yes", "on"}
+SMTP_TIMEOUT_SECONDS = float(os.environ.get("SMTP_TIMEOUT_SECONDS", "10"))
 SDK_VERIFICATION_BASE_URL = os.environ.get(
     "SDK_VERIFICATION_BASE_URL", "http://localhost:3000"
 ).rstrip("/")
 SDK_DEFAULT_DSN = os.environ.get("SDK_DEFAULT_DSN", "http://localhost:8001").rstrip("/")
+APPS_CACHE_TTL_SECONDS = float(os.environ.get("APPS_CACHE_TTL_SECONDS", "5"))
 SDK_SCHEMA_STRICT_STARTUP = os.environ.get("SDK_SCHEMA_STRICT_STARTUP", "false").lower() in {
     "1",
     "true",
@@ -67,6 +88,34 @@ SDK_SCHEMA_STRICT_STARTUP = os.environ.get("SDK_SCHEMA_STRICT_STARTUP", "false")
     "on",
 }
 
+# One lock per app so concurrent ingests for the same app are processed in
+# order (risk history + notification state are read-modify-write files).
+# With several workers, process_ingest_batch also holds a file lock.
+_ingest_locks: dict[str, asyncio.Lock] = {}
+
+# Encoded /summary response bodies keyed by path -> (etag, body); the etag
+# is derived from the file's mtime/size so a rewrite invalidates the entry.
+_summary_cache: dict[str, tuple[str, bytes]] = {}
+
+# Short-lived /apps and /apps/{app_id} results keyed by query ->
+# (expires_at, data). The dashboard polls these; create/delete clear it.
+_apps_cache: dict[str, tuple[float, object]] = {}
+
+
+def get_cached_apps(key: str):
+    entry = _apps_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _apps_cache.pop(key, None)
+        return None
+    return entry[1]
+
+
+def set_cached_apps(key: str, data) -> None:
+    if APPS_CACHE_TTL_SECONDS > 0:
+        _apps_cache[key] = (time.monotonic() + APPS_CACHE_TTL_SECONDS, data)
+
 
 # =========================================
 # Schemas
@@ -110,6 +159,10 @@ async def health_check():
 @app.get("/apps")
 async def list_apps(user_id: str = Query(...)):
     """List all apps for a user."""
+    cache_key = f"user:{user_id}"
+    cached = get_cached_apps(cache_key)
+    if cached is not None:
+        return cached
     client = _get_supabase()
     if not client:
         raise HTTPException(status_code=503, detail="Database not configured")
@@ -121,7 +174,9 @@ async def list_apps(user_id: str = Query(...)):
             .order("created_at", desc=True)
             .execute()
         )
-        return result.data or []
+        apps = result.data or []
+        set_cached_apps(cache_key, apps)
+        return apps
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
@@ -129,6 +184,10 @@ async def list_apps(user_id: str = Query(...)):
 @app.get("/apps/{app_id}")
 async def get_app(app_id: str):
     """Get a single app by ID."""
+    cache_key = f"app:{app_id}"
+    cached = get_cached_apps(cache_key)
+    if cached is not None:
+        return cached
     client = _get_supabase()
     if not client:
         raise HTTPException(status_code=503, detail="Database not configured")
@@ -142,6 +201,7 @@ async def get_app(app_id: str):
         )
         if not result.data:
             raise HTTPException(status_code=404, detail="App not found")
+        set_cached_apps(cache_key, result.data)
         return result.data
     except HTTPException:
         raise
@@ -175,6 +235,7 @@ async def create_app(request: CreateAppRequest):
         )
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create app")
+        _apps_cache.clear()
         return result.data
     except HTTPException:
         raise
@@ -195,6 +256,7 @@ async def delete_app(app_id: str):
             .eq("id", app_id)
             .execute()
         )
+        _apps_cache.clear()
         return {"status": "deleted", "app_id": app_id}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
@@ -256,7 +318,7 @@ def post_webhook(payload: dict) -> tuple[bool, str]:
             method="POST",
             headers={"Content-Type": "application/json"},
         )
-        with urllib.request.urlopen(request, timeout=5):
+        with urllib.request.urlopen(request, timeout=RISK_ALERT_WEBHOOK_TIMEOUT_SECONDS):
             pass
         return True, "sent"
     except Exception as exc:
@@ -270,13 +332,14 @@ def resolve_email_recipients(app_id: str) -> list[str]:
 
 
 def send_email_alert(app_id: str, payload: dict) -> tuple[bool, str]:
-    recipients = resolve_email_recipients(app_id)
-    if not recipients:
-        return False, "email_not_configured:missing_recipient"
+    # Check local config before resolving recipients, which may hit the DB.
     if not EMAIL_ALERT_FROM:
         return False, "email_not_configured:missing_sender"
     if not SMTP_HOST:
         return False, "email_not_configured:missing_smtp_host"
+    recipients = resolve_email_recipients(app_id)
+    if not recipients:
+        return False, "email_not_configured:missing_recipient"
 
     message = EmailMessage()
     message["From"] = EMAIL_ALERT_FROM
@@ -321,13 +384,13 @@ def send_email_alert(app_id: str, payload: dict) -> tuple[bool, str]:
     try:
         if SMTP_USE_TLS:
             context = ssl.create_default_context()
-            with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=10) as server:
+            with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS) as server:
                 server.starttls(context=context)
                 if SMTP_USERNAME:
                     server.login(SMTP_USERNAME, SMTP_PASSWORD)
                 server.send_message(message)
         else:
-            with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=10) as server:
+            with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS) as server:
                 if SMTP_USERNAME:
                     server.login(SMTP_USERNAME, SMTP_PASSWORD)
                 server.send_message(message)
@@ -350,6 +413,10 @@ def trigger_risk_notifications(app_id: str, outputs_dir: str, dashboard: dict) -
 
     now_epoch = datetime.now(timezone.utc).timestamp()
     triggered = []
+    # A channel that failed once in this batch is skipped for the remaining
+    # services so one unreachable endpoint doesn't stall every alert in turn.
+    webhook_failed = False
+    email_failed = False
 
     for service in at_risk_services:
         service_state = state.get(service, {})
@@ -378,8 +445,16 @@ def trigger_risk_notifications(app_id: str, outputs_dir: str, dashboard: dict) -
             "recommendations": dashboard.get("service_recommendations", {}).get(service, []),
         }
 
-        webhook_sent, webhook_status = post_webhook(payload)
-        email_sent, email_status = send_email_alert(app_id, payload)
+        if webhook_failed:
+            webhook_sent, webhook_status = False, "skipped:previous_failure"
+        else:
+            webhook_sent, webhook_status = post_webhook(payload)
+            webhook_failed = webhook_status.startswith("failed:")
+        if email_failed:
+            email_sent, email_status = False, "skipped:previous_failure"
+        else:
+            email_sent, email_status = send_email_alert(app_id, payload)
+            email_failed = email_status.startswith("failed:")
 
         payload["delivery"] = {
             "webhook": {"sent": webhook_sent, "status": webhook_status},
@@ -402,6 +477,23 @@ def trigger_risk_notifications(app_id: str, outputs_dir: str, dashboard: dict) -
     return triggered
 
 
+def get_ingest_lock(app_id: str) -> asyncio.Lock:
+    lock = _ingest_locks.get(app_id)
+    if lock is None:
+        lock = _ingest_locks[app_id] = asyncio.Lock()
+    return lock
+
+
+def process_ingest_batch(app_id: str, logs: List[str], outputs_dir: str) -> tuple[dict, list[dict]]:
+    """Run the blocking processing + alert delivery for one ingest batch."""
+    with open(os.path.join(outputs_dir, INGEST_LOCK_FILE), "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        dashboard = process_and_summarize_stream(logs, outputs_dir)
+        notifications = trigger_risk_notifications(app_id, outputs_dir, dashboard)
+    return dashboard, notifications
+
+
 def get_api_key(
     authorization: Optional[str] = Header(None),
     x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
@@ -496,6 +588,8 @@ async def sdk_device_complete(request: DeviceCompleteRequest):
     )
     if not result:
         raise HTTPException(status_code=400, detail="Unable to complete device session")
+    # Linking a device inserts a new app row for this user.
+    _apps_cache.clear()
     return {"status": "approved", **result}
 
 
@@ -510,7 +604,11 @@ async def sdk_schema_validate():
 # =========================================
 # Log Ingest (SDK push)
 # =========================================
-@app.post("/ingest")
+# The SDK gzips larger batches; GzipRoute inflates them before validation.
+ingest_router = APIRouter(route_class=GzipRoute)
+
+
+@ingest_router.post("/ingest")
 async def ingest_logs(
     request: IngestRequest,
     api_key: str = Depends(get_api_key),
@@ -529,36 +627,62 @@ async def ingest_logs(
     outputs_dir = os.path.join(os.path.dirname(__file__), "outputs", app_id)
     os.makedirs(outputs_dir, exist_ok=True)
 
-    dashboard = process_and_summarize_stream(request.logs, outputs_dir)
-    notifications = trigger_risk_notifications(app_id, outputs_dir, dashboard)
+    # Processing, file writes, webhook and SMTP delivery are all blocking, so
+    # keep them off the event loop; batches for the same app queue on its lock.
+    async with get_ingest_lock(app_id):
+        dashboard, notifications = await run_in_threadpool(
+            process_ingest_batch, app_id, request.logs, outputs_dir
+        )
 
-    return {
-        "status": "accepted",
-        "app_id": app_id,
-        "processed": len(request.logs),
-        "notifications_triggered": len(notifications),
-        "dashboard_summary": dashboard,
-    }
+    # The dashboard is already plain JSON data; skip jsonable_encoder's walk.
+    return ORJSONResponse(
+        {
+            "status": "accepted",
+            "app_id": app_id,
+            "processed": len(request.logs),
+            "notifications_triggered": len(notifications),
+            "dashboard_summary": dashboard,
+        }
+    )
+
+
+app.include_router(ingest_router)
 
 
 # =========================================
 # Summary (for frontend polling)
 # =========================================
 @app.get("/summary/{app_id}")
-async def get_summary(app_id: str):
+async def get_summary(
+    app_id: str,
+    if_none_match: Optional[str] = Header(None),
+):
     """Return latest dashboard summary for an app. Used by frontend polling."""
     summary_path = os.path.join(
         os.path.dirname(__file__), "outputs", app_id, "dashboard_summary.json"
     )
-    if not os.path.exists(summary_path):
-        return {"summary": None}
     try:
-        with open(summary_path, "r", encoding="utf-8") as f:
-            summary = json.load(f)
-        return {"summary": summary}
-    except Exception:
+        stat = os.stat(summary_path)
+    except OSError:
         return {"summary": None}
 
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    cached = _summary_cache.get(summary_path)
+    if cached is None or cached[0] != etag:
+        try:
+            with open(summary_path, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+        except Exception:
+            return {"summary": None}
+        body = orjson.dumps({"summary": summary})
+        cached = _summary_cache[summary_path] = (etag, body)
+
+    return Response(content=cached[1], media_type="application/json", headers=headers)
+
 
 @app.get("/notifications/{app_id}")
 async def get_notifications(app_id: str):
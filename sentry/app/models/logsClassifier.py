@@ -1,6 +1,7 @@
 import json
 import logging
 import time
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from pydantic import BaseModel, Field
 from agno.agent import Agent
@@ -172,7 +173,11 @@ def get_agent() -> Agent:
         response_model=LogsClassifier,
     )
 
-AGENT_MAIN = get_agent()
+@lru_cache(maxsize=1)
+def get_shared_agent() -> Agent:
+    """Build the agent on first use and reuse it for every later call."""
+    logging.info("Initialized new agent instance")
+    return get_agent()
 
 # --------------------------------------------
 # Agent Management for Performance Optimization
@@ -181,19 +186,13 @@ AGENT_MAIN = get_agent()
 class AgentManager:
     """Manages agent instances for optimal performance in batch operations."""
     
-    def __init__(self):
-        self._agent = None
-    
     def get_agent(self) -> Agent:
         """Get or create agent instance (singleton pattern for performance)."""
-        if self._agent is None:
-            self._agent = get_agent()
-            logging.info("Initialized new agent instance")
-        return self._agent
+        return get_shared_agent()
     
     def reset_agent(self):
         """Reset agent instance (useful for error recovery)."""
-        self._agent = None
+        get_shared_agent.cache_clear()
         logging.info("Agent instance reset")
 
 # Global agent manager instance
@@ -217,8 +216,8 @@ def classify_log_with_retry(log_data: dict, max_retries: int = 3, agent: Optiona
         max_retries: Maximum number of retry attempts
         agent: Optional pre-initialized agent for performance optimization
     """
-    # Use provided agent or fall back to global instance
-    classifier_agent = agent or AGENT_MAIN
+    # Use provided agent or fall back to the shared instance
+    classifier_agent = agent or get_shared_agent()
     
     # Extract timestamp if available
     timestamp = log_data.get("timestamp") if isinstance(log_data, dict) else None
@@ -268,7 +267,7 @@ def classify_log_with_retry(log_data: dict, max_retries: int = 3, agent: Optiona
                     
                     result = LogsClassifier(**result_dict)
                 except Exception as parse_exc:
-                    logging.warning(f"Could not parse LLM string result: {parse_exc}. Using fallback.")
+                    logging.warning("Could not parse LLM string result: %s. Using fallback.", parse_exc)
                     return FallbackClassification.create_fallback(log_data, timestamp)
             else:
                 # Add timestamp to the result (for Pydantic model objects)
@@ -292,15 +291,15 @@ def classify_log_with_retry(log_data: dict, max_retries: int = 3, agent: Optiona
             if isinstance(result.severity_level, str):
                 result.severity_level = normalize_severity(result.severity_level)
             
-            logging.info(f"Successfully classified log on attempt {attempt + 1}")
+            logging.info("Successfully classified log on attempt %d", attempt + 1)
             return result
             
         except Exception as e:
-            logging.warning(f"Attempt {attempt + 1} failed: {e}")
+            logging.warning("Attempt %d failed: %s", attempt + 1, e)
             if attempt < max_retries - 1:
                 time.sleep(2 ** attempt)  # Exponential backoff
             else:
-                logging.error(f"All {max_retries} attempts failed. Using fallback classification.")
+                logging.error("All %d attempts failed. Using fallback classification.", max_retries)
                 return FallbackClassification.create_fallback(log_data, timestamp)
 
 def classify_log(log_line: str, agent: Optional[Agent] = None) -> LogsClassifier:
@@ -320,10 +319,10 @@ def classify_logs(input_path: str, output_path: str, agent: Optional[Agent] = No
         output_path: Path to save classified results
         agent: Optional pre-initialized agent for performance optimization
     """
-    # Initialize agent if not provided (for repeated calls optimization)
+    # Reuse the shared agent if none was provided
     if agent is None:
-        agent = get_agent()
-        logging.info("Initialized new agent for classification")
+        agent = get_shared_agent()
+        logging.info("Using shared agent for classification")
     else:
         logging.info("Using provided pre-initialized agent")
     
@@ -333,7 +332,7 @@ def classify_logs(input_path: str, output_path: str, agent: Optional[Agent] = No
         log_data = json.load(f)
 
     total_logs = len(log_data)
-    logging.info(f"Processing {total_logs} log entries...")
+    logging.info("Processing %d log entries...", total_logs)
 
     for idx, (key, log_entry) in enumerate(log_data.items(), 1):
         try:
@@ -348,10 +347,10 @@ def classify_logs(input_path: str, output_path: str, agent: Optional[Agent] = No
             results.append(structured)
             
             if idx % 10 == 0:  # Progress logging
-                logging.info(f"Processed {idx}/{total_logs} logs...")
+                logging.info("Processed %d/%d logs...", idx, total_logs)
                 
         except Exception as e:
-            logging.error(f"[!] Critical error processing log {key}: {e}")
+            logging.error("[!] Critical error processing log %s: %s", key, e)
             # Create emergency fallback
             fallback = FallbackClassification.create_fallback(log_entry)
             results.append(fallback)
@@ -360,7 +359,7 @@ def classify_logs(input_path: str, output_path: str, agent: Optional[Agent] = No
     with open(output_path, "w") as f:
         json.dump([log.dict() for log in results], f, indent=2)
 
-    logging.info(f"Saved {len(results)} structured logs to {output_path}")
+    logging.info("Saved %d structured logs to %s", len(results), output_path)
     return results
 
 def classify_multiple_files(file_pairs: List[Tuple[str, str]], use_preloaded_agent: bool = True) -> Dict[str, List[LogsClassifier]]:
@@ -379,18 +378,19 @@ def classify_multiple_files(file_pairs: List[Tuple[str, str]], use_preloaded_age
     if use_preloaded_agent:
         # Use a single agent instance for all files (performance optimization)
         agent = get_preloaded_agent()
-        logging.info(f"Processing {len(file_pairs)} files with preloaded agent")
+        logging.info("Processing %d files with preloaded agent", len(file_pairs))
     else:
         agent = None
-        logging.info(f"Processing {len(file_pairs)} files with fresh agent instances")
+        logging.info("Processing %d files with fresh agent instances", len(file_pairs))
     
     for input_path, output_path in file_pairs:
         try:
-            logging.info(f"Processing file: {input_path}")
-            file_results = classify_logs(input_path, output_path, agent=agent)
+            logging.info("Processing file: %s", input_path)
+            file_agent = agent if use_preloaded_agent else get_agent()
+            file_results = classify_logs(input_path, output_path, agent=file_agent)
             results[input_path] = file_results
         except Exception as e:
-            logging.error(f"Failed to process {input_path}: {e}")
+            logging.error("Failed to process %s: %s", input_path, e)
             results[input_path] = []
     
     return results
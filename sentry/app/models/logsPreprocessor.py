@@ -12,29 +12,39 @@ ANOMALY_KEYWORDS = [
     "panic", "stacktrace", "crash", "fatal", "killed"
 ]
 
+# Compiled once; these run against every line of the input file
+NON_ERROR_LEVEL_REGEX = re.compile(r"\b(INFO|DEBUG|TRACE)\b", re.IGNORECASE)
+ANOMALY_KEYWORD_REGEX = re.compile("|".join(map(re.escape, ANOMALY_KEYWORDS)), re.IGNORECASE)
+TIMESTAMP_REGEX = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:,\d+)?")
+COMPACT_ERROR_REGEX = re.compile(
+    r"\[(.*?)\].*?(Exception|Failed|Error|Refused|Timeout|Killed|Unavailable|Crash|Panic)",
+    re.IGNORECASE,
+)
+ISSUE_REGEX = re.compile(
+    r"(Exception.*|Failed.*|Error.*|Refused.*|Timeout.*|Killed.*|Unavailable.*|Crash.*|Panic.*)",
+    re.IGNORECASE,
+)
+
 def is_anomalous(log_line: str) -> bool:
-    log_level_match = re.search(r"\b(INFO|DEBUG|TRACE)\b", log_line, re.IGNORECASE)
-    if log_level_match:
+    if NON_ERROR_LEVEL_REGEX.search(log_line):
         return False  # Skip non-error logs
-    for keyword in ANOMALY_KEYWORDS:
-        if keyword in log_line.lower():
-            return True
-    return False
+    return ANOMALY_KEYWORD_REGEX.search(log_line) is not None
 
 def extract_timestamp(log_line: str) -> str:
     """Extract timestamp from log line using regex pattern."""
-    timestamp_match = re.search(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:,\d+)?", log_line)
+    timestamp_match = TIMESTAMP_REGEX.search(log_line)
     return timestamp_match.group(0) if timestamp_match else "UNKNOWN"
 
 def extract_compact_error(log_line: str) -> str:
     # Try to extract the service and a summary
-    match = re.search(r"\[(.*?)\].*?(Exception|Failed|Error|Refused|Timeout|Killed|Unavailable|Crash|Panic)", log_line, re.IGNORECASE)
+    match = COMPACT_ERROR_REGEX.search(log_line)
     if match:
         service = match.group(1)
-        issue = re.search(r"(Exception.*|Failed.*|Error.*|Refused.*|Timeout.*|Killed.*|Unavailable.*|Crash.*|Panic.*)", log_line, re.IGNORECASE)
+        issue = ISSUE_REGEX.search(log_line)
         if issue:
             return f"{issue.group(0).strip()} in {service}"
-    return f"Anomaly detected: {log_line.replace('\t', ' ').strip()}"
+    compact_line = log_line.replace("\t", " ").strip()
+    return f"Anomaly detected: {compact_line}"
 
 def extract_anomaly_metadata(log_line: str, line_number: int, source_file: str = None) -> dict:
     """Extract comprehensive metadata for an anomalous log line."""
@@ -83,7 +93,7 @@ def process_logs(input_path: str, output_path: str, source_file: str = None) ->
     with open(output_path, "w") as outfile:
         json.dump(result, outfile, indent=2)
 
-    logging.info(f"Extracted {count - 1} unique anomalies to {output_path}")
+    logging.info("Extracted %d unique anomalies to %s", count - 1, output_path)
     return result
 
 if __name__ == "__main__":
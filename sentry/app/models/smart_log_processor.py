@@ -1,15 +1,16 @@
 import os
 import re
+import sys
 import json
-import random
+import orjson
 from datetime import datetime, timezone
-from collections import defaultdict, Counter
-from typing import List
+from collections import defaultdict, deque, Counter
 
 # =====================================================================
 # Regex patterns & keyword sets
 # =====================================================================
 SERVICE_REGEX = re.compile(r"\[(.*?)\]")
+TIMESTAMP_REGEX = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:,\d+)?")
 RISK_HISTORY_FILE = "risk_history.json"
 
 ERROR_TYPE_KEYWORDS = {
@@ -21,6 +22,54 @@ ERROR_TYPE_KEYWORDS = {
     "Unknown": []
 }
 
+
+def _keyword_regex(keywords) -> re.Pattern:
+    """One alternation matching any of the keywords in lower-cased text.
+
+    Lines are lower-cased once and matched case-sensitively; re.IGNORECASE
+    makes a long alternation several times slower than plain substring tests.
+    """
+    return re.compile("|".join(re.escape(k.lower()) for k in keywords))
+
+
+# Checked in order by extract_severity(); the first category that matches wins.
+SEVERITY_KEYWORDS = [
+    ("Low", ["success", "connected successfully", "completed", "started", "running"]),
+    ("High", [
+        "fatal", "critical", "emergency", "crash", "panic",
+        "exception", "error 5", "failed", "503", "500", "unavailable"
+    ]),
+    ("Medium", ["warn", "retry", "timeout", "delay", "degraded", "slow"]),
+]
+SEVERITY_PATTERNS = [(severity, _keyword_regex(keywords)) for severity, keywords in SEVERITY_KEYWORDS]
+
+NO_ERROR_KEYWORDS = ["success", "completed", "connected", "running"]
+NO_ERROR_REGEX = _keyword_regex(NO_ERROR_KEYWORDS)
+ERROR_TYPE_PATTERNS = [
+    (etype, _keyword_regex(keywords))
+    for etype, keywords in ERROR_TYPE_KEYWORDS.items()
+    if keywords
+]
+
+# Bound search methods used by the per-line classifiers
+_SEVERITY_SEARCHES = tuple((severity, pattern.search) for severity, pattern in SEVERITY_PATTERNS)
+_ERROR_TYPE_SEARCHES = tuple((etype, pattern.search) for etype, pattern in ERROR_TYPE_PATTERNS)
+_no_error_search = NO_ERROR_REGEX.search
+
+# Every keyword either classifier looks for; a line matching none of them
+# is ("Low", "Unknown") without running the per-category searches.
+ANY_KEYWORD_REGEX = _keyword_regex(
+    [k for _, keywords in SEVERITY_KEYWORDS for k in keywords]
+    + NO_ERROR_KEYWORDS
+    + [k for keywords in ERROR_TYPE_KEYWORDS.values() for k in keywords]
+)
+_any_keyword_search = ANY_KEYWORD_REGEX.search
+
+INCIDENT_REGEX = _keyword_regex([
+    "fatal", "panic", "crash", "outofmemory", "oom", "connection refused",
+    "timeout", "503", "500", "unavailable", "failed", "exception"
+])
+
 ERROR_TYPE_RECOMMENDATIONS = {
     "Database Error": "Check DB connectivity, connection pool saturation, and slow queries.",
     "Network Error": "Inspect upstream latency, retry backoff, and circuit-breaker behavior.",
@@ -57,6 +106,13 @@ def save_risk_history(output_dir: str, history: dict) -> None:
         json.dump(history, f, indent=2)
 
 
+def write_json(path: str, payload, pretty: bool = False) -> None:
+    """Write payload with orjson; only pretty-print small, human-read files."""
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(payload, option=option))
+
+
 def append_risk_history(history: dict, service: str, score: float) -> list:
     records = history.get(service, [])
     records.append({"timestamp": utc_now_iso(), "score": score})
@@ -64,61 +120,65 @@ def append_risk_history(history: dict, service: str, score: float) -> list:
     return history[service]
 
 
-def extract_service(line: str, known_services: List[str]) -> str:
+UNKNOWN_SERVICE = "unknown"
+
+
+def extract_service(line: str) -> str:
     """Extracts the second bracketed value as the service name, if available."""
     matches = SERVICE_REGEX.findall(line)
     if len(matches) >= 2:
         return matches[1]
-    if known_services:
-        return random.choice(known_services)
-    return random.choice([
-        "auth-service", "api-gateway", "user-service",
-        "payment-service", "notification-service", "inventory-service"
-    ])
+    return UNKNOWN_SERVICE
 
 
-def extract_severity(line: str) -> str:
-    """Classify log severity using contextual keyword detection."""
-    line_lower = line.lower()
+def _severity_of(line_lower: str) -> str:
+    for severity, search in _SEVERITY_SEARCHES:
+        if search(line_lower):
+            return severity
+    return "Low"
 
-    if any(word in line_lower for word in ["success", "connected successfully", "completed", "started", "running"]):
-        return "Low"
 
-    if any(word in line_lower for word in [
-        "fatal", "critical", "emergency", "crash", "panic",
-        "exception", "error 5", "failed", "503", "500", "unavailable"
-    ]):
-        return "High"
+def _error_type_of(line_lower: str) -> str:
+    if _no_error_search(line_lower):
+        return "None"
 
-    if any(word in line_lower for word in ["warn", "retry", "timeout", "delay", "degraded", "slow"]):
-        return "Medium"
+    for etype, search in _ERROR_TYPE_SEARCHES:
+        if search(line_lower):
+            return etype
+    return "Unknown"
 
-    if any(word in line_lower for word in ["info", "debug", "connected", "success", "started", "completed"]):
-        return "Low"
 
-    return "Low"
+def extract_severity(line: str) -> str:
+    """Classify log severity using contextual keyword detection."""
+    return _severity_of(line.lower())
 
 
 def extract_error_type(line: str) -> str:
     """Detects the general error type based on known keywords."""
-    line_lower = line.lower()
+    return _error_type_of(line.lower())
 
-    if any(word in line_lower for word in ["success", "completed", "connected", "running"]):
-        return "None"
 
-    for etype, keywords in ERROR_TYPE_KEYWORDS.items():
-        if etype == "Unknown":
-            continue
-        if any(k in line_lower for k in keywords):
-            return etype
-    return "Unknown"
+def classify_line(line: str) -> tuple:
+    """Return (severity, error_type) for a log line, lower-casing it once."""
+    line_lower = line.lower()
+    if not _any_keyword_search(line_lower):
+        return "Low", "Unknown"
+    return _severity_of(line_lower), _error_type_of(line_lower)
 
 
-def count_errors_per_n_logs(entries, n=10):
-    """Compute weighted error count over rolling batches."""
+def count_errors_per_n_logs(severity_levels, n=10):
+    """Compute weighted error count over rolling batches of severity levels."""
     severity_weights = {"High": 1.0, "Medium": 0.3, "Low": 0.0}
-    batches = [entries[i:i+n] for i in range(0, len(entries), n)]
-    return [sum(severity_weights.get(e["severity_level"], 0) for e in batch) for batch in batches]
+    counts = []
+    batch_total = 0
+    for i, severity in enumerate(severity_levels, 1):
+        batch_total += severity_weights.get(severity, 0)
+        if i % n == 0:
+            counts.append(batch_total)
+            batch_total = 0
+    if len(severity_levels) % n:
+        counts.append(batch_total)
+    return counts
 
 
 def avg_errors_per_full_batches(errors_per_n, total_logs, n=10):
@@ -129,9 +189,10 @@ def avg_errors_per_full_batches(errors_per_n, total_logs, n=10):
     return sum(errors_per_n[:full_batches]) / full_batches
 
 
-def determine_service_health(entries):
+def determine_service_health(entries, severity_counts=None):
     """Evaluates health based on severity ratios."""
-    severity_counts = Counter(e["severity_level"] for e in entries)
+    if severity_counts is None:
+        severity_counts = Counter(e["severity_level"] for e in entries)
     total_logs = len(entries)
     if total_logs == 0:
         return "healthy"
@@ -146,7 +207,7 @@ def determine_service_health(entries):
     return "healthy"
 
 
-def calculate_service_risk(entries):
+def calculate_service_risk(entries, severity_counts=None, error_type_counts=None):
     """Return a risk summary for service failure prediction."""
     total_logs = len(entries)
     if total_logs == 0:
@@ -158,7 +219,8 @@ def calculate_service_risk(entries):
             "recommendations": []
         }
 
-    severity_counts = Counter(e["severity_level"] for e in entries)
+    if severity_counts is None:
+        severity_counts = Counter(e["severity_level"] for e in entries)
     high_count = severity_counts["High"]
     medium_count = severity_counts["Medium"]
     low_count = severity_counts["Low"]
@@ -168,14 +230,9 @@ def calculate_service_risk(entries):
     recent_medium = sum(1 for e in recent_window if e["severity_level"] == "Medium")
     recent_high_ratio = recent_high / len(recent_window)
 
-    incident_keywords = (
-        "fatal", "panic", "crash", "outofmemory", "oom", "connection refused",
-        "timeout", "503", "500", "unavailable", "failed", "exception"
-    )
     incident_hits = 0
     for entry in recent_window:
-        line = entry.get("line", "").lower()
-        if any(keyword in line for keyword in incident_keywords):
+        if INCIDENT_REGEX.search(entry.get("line", "").lower()):
             incident_hits += 1
 
     weighted_intensity = ((high_count * 1.0) + (medium_count * 0.5)) / total_logs
@@ -208,7 +265,9 @@ def calculate_service_risk(entries):
     if not reasons:
         reasons.append("No strong failure indicators currently detected.")
 
-    error_type_counts = Counter(e["error_type"] for e in entries if e["error_type"] != "None")
+    if error_type_counts is None:
+        error_type_counts = Counter(e["error_type"] for e in entries)
+    error_type_counts = Counter({k: v for k, v in error_type_counts.items() if k != "None"})
     recommendations = []
     for error_type, _ in error_type_counts.most_common(3):
         recommendation = ERROR_TYPE_RECOMMENDATIONS.get(error_type)
@@ -297,22 +356,40 @@ def process_and_summarize_stream(log_iterable, output_dir: str):
     """
     os.makedirs(output_dir, exist_ok=True)
 
-    processed = {}
+    processed = []
+    # Severity per line in input order, for the errors-per-10 series
+    severity_levels = []
     grouped = defaultdict(list)
+    # Per-service aggregates, updated per line so the dashboard build does
+    # not rescan each service's entries
+    severity_counts = defaultdict(Counter)
+    error_type_counts = defaultdict(Counter)
+    first_timestamps = {}
+    latest_timestamps = {}
+    recent_entries = defaultdict(lambda: deque(maxlen=5))
     summaries = {}
-    error_timeline = defaultdict(list)
     risk_history = load_risk_history(output_dir)
 
-    lines = [line.strip() for line in log_iterable if line.strip()]
-    known_services = list({SERVICE_REGEX.search(line).group(1)
-                           for line in lines if SERVICE_REGEX.search(line)})
+    # Hot-loop lookups bound to locals
+    _extract_service = extract_service
+    # Service names are sliced out of each line; interning makes every entry
+    # for a service share one string (severity and error type are already
+    # module constants).
+    _intern = sys.intern
+    _classify_line = classify_line
+    _timestamp_search = TIMESTAMP_REGEX.search
+
+    idx = 0
+    for raw_line in log_iterable:
+        line = raw_line.strip()
+        if not line:
+            continue
+        idx += 1
 
-    for idx, line in enumerate(lines, 1):
-        service = extract_service(line, known_services)
-        severity = extract_severity(line)
-        error_type = extract_error_type(line)
+        service = _intern(_extract_service(line))
+        severity, error_type = _classify_line(line)
 
-        timestamp_match = re.search(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:,\d+)?", line)
+        timestamp_match = _timestamp_search(line)
         timestamp = timestamp_match.group(0) if timestamp_match else "UNKNOWN"
 
         entry = {
@@ -324,16 +401,21 @@ def process_and_summarize_stream(log_iterable, output_dir: str):
             "line_number": idx
         }
 
-        processed[str(idx)] = entry
+        processed.append(entry)
+        severity_levels.append(severity)
         grouped[service].append(entry)
-        error_timeline[service].append({
-            "timestamp": timestamp,
-            "error_type": error_type,
-            "severity": severity,
-            "line": line
-        })
-
-    errors_per_10 = count_errors_per_n_logs(list(processed.values()), 10)
+        recent_entries[service].append(entry)
+        severity_counts[service][severity] += 1
+        error_type_counts[service][error_type] += 1
+        if timestamp != "UNKNOWN":
+            if service not in first_timestamps:
+                first_timestamps[service] = latest_timestamps[service] = timestamp
+            elif timestamp < first_timestamps[service]:
+                first_timestamps[service] = timestamp
+            elif timestamp > latest_timestamps[service]:
+                latest_timestamps[service] = timestamp
+
+    errors_per_10 = count_errors_per_n_logs(severity_levels, 10)
     avg_errors = avg_errors_per_full_batches(errors_per_10, len(processed), 10)
 
     dashboard = {
@@ -361,24 +443,23 @@ def process_and_summarize_stream(log_iterable, output_dir: str):
     }
 
     for service, entries in grouped.items():
-        severity_counts = Counter(e["severity_level"] for e in entries)
-        error_type_counts = Counter(e["error_type"] for e in entries)
+        service_severity_counts = severity_counts[service]
+        service_error_type_counts = error_type_counts[service]
 
-        health = determine_service_health(entries)
+        health = determine_service_health(entries, service_severity_counts)
 
         dashboard["service_health"][service] = health
-        dashboard["severity_distribution"][service] = dict(severity_counts)
+        dashboard["severity_distribution"][service] = dict(service_severity_counts)
         dashboard["most_common_errors"][service] = (
-            error_type_counts.most_common(1)[0][0] if error_type_counts else "Other"
+            service_error_type_counts.most_common(1)[0][0] if service_error_type_counts else "Other"
         )
-        dashboard["recent_errors"][service] = entries[-5:]
+        dashboard["recent_errors"][service] = list(recent_entries[service])
 
-        timestamps = [e["timestamp"] for e in entries if e["timestamp"] != "UNKNOWN"]
-        dashboard["first_error_timestamp"][service] = min(timestamps) if timestamps else "UNKNOWN"
-        dashboard["latest_error_timestamp"][service] = max(timestamps) if timestamps else "UNKNOWN"
-        dashboard["error_types"][service] = list({e["error_type"] for e in entries})
+        dashboard["first_error_timestamp"][service] = first_timestamps.get(service, "UNKNOWN")
+        dashboard["latest_error_timestamp"][service] = latest_timestamps.get(service, "UNKNOWN")
+        dashboard["error_types"][service] = list(service_error_type_counts)
 
-        risk = calculate_service_risk(entries)
+        risk = calculate_service_risk(entries, service_severity_counts, service_error_type_counts)
         service_history = append_risk_history(risk_history, service, risk["score"])
         forecast = compute_failure_forecast(service_history, risk["score"], risk["level"])
 
@@ -401,12 +482,13 @@ def process_and_summarize_stream(log_iterable, output_dir: str):
 
     save_risk_history(output_dir, risk_history)
 
-    with open(os.path.join(output_dir, "processed_logs.json"), "w", encoding="utf-8") as f:
-        json.dump(processed, f, indent=2)
-    with open(os.path.join(output_dir, "grouped_logs.json"), "w", encoding="utf-8") as f:
-        json.dump({"grouped": grouped, "summaries": summaries}, f, indent=2)
-    with open(os.path.join(output_dir, "dashboard_summary.json"), "w", encoding="utf-8") as f:
-        json.dump(dashboard, f, indent=2)
+    # processed_logs.json stays keyed by line number ("1", "2", ...)
+    write_json(
+        os.path.join(output_dir, "processed_logs.json"),
+        {str(entry["line_number"]): entry for entry in processed},
+    )
+    write_json(os.path.join(output_dir, "grouped_logs.json"), {"grouped": grouped, "summaries": summaries})
+    write_json(os.path.join(output_dir, "dashboard_summary.json"), dashboard, pretty=True)
 
     return dashboard
 
@@ -416,7 +498,6 @@ def process_and_summarize_stream(log_iterable, output_dir: str):
 # =====================================================================
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) < 2:
         print("Usage: python -m app.models.smart_log_processor <outputdir>")
         sys.exit(1)
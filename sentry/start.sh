@@ -1,3 +1,3 @@
 #!/bin/bash
 source venv/bin/activate
-uvicorn app.main:app --reload --port 8001
+uvicorn app.main:app --reload --port 8001 --loop uvloop
@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+
+import app.main as main
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _AppsQuery:
+    def __init__(self, rows):
+        self._rows = rows
+        self._user_id = None
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, column, value):
+        if column == "user_id":
+            self._user_id = value
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def execute(self):
+        return _Result([row for row in self._rows if row["user_id"] == self._user_id])
+
+
+class _FakeSupabase:
+    def __init__(self):
+        self.rows = []
+
+    def table(self, name):
+        assert name == "apps"
+        return _AppsQuery(self.rows)
+
+
+def test_device_link_invalidates_cached_app_list(monkeypatch):
+    fake = _FakeSupabase()
+    monkeypatch.setattr(main, "_get_supabase", lambda: fake)
+    monkeypatch.setattr(main, "APPS_CACHE_TTL_SECONDS", 60.0)
+    main._apps_cache.clear()
+
+    def complete_device_session(device_code, user_id, app_name_override=None):
+        # Mirrors api_key.complete_device_session inserting the linked app.
+        fake.rows.append({"id": "app-1", "user_id": user_id, "name": "cli-app"})
+        return {"app_id": "app-1", "api_key": "sk_test", "app_name": "cli-app"}
+
+    monkeypatch.setattr(main, "complete_device_session", complete_device_session)
+    client = TestClient(main.app)
+
+    assert client.get("/apps", params={"user_id": "user-1"}).json() == []
+
+    response = client.post(
+        "/sdk/device/complete", json={"device_code": "dev-1", "user_id": "user-1"}
+    )
+    assert response.status_code == 200
+
+    apps = client.get("/apps", params={"user_id": "user-1"}).json()
+    assert [app["id"] for app in apps] == ["app-1"]
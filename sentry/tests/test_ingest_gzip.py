@@ -0,0 +1,71 @@
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.gzip_request as gzip_request
+import app.main as main
+
+LOGS = [f"2024-01-01 00:00:00,000 [INFO] [svc]: line {i}" for i in range(20)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    processed = []
+
+    def process_ingest_batch(app_id, logs, outputs_dir):
+        processed.append(logs)
+        return {}, []
+
+    monkeypatch.setattr(main, "resolve_api_key_to_app_id", lambda api_key: "app-1")
+    monkeypatch.setattr(main, "process_ingest_batch", process_ingest_batch)
+    monkeypatch.setattr(main.os, "makedirs", lambda *args, **kwargs: None)
+    client = TestClient(main.app)
+    client.processed = processed
+    return client
+
+
+def _post_gzip(client, body: bytes):
+    return client.post(
+        "/ingest",
+        content=body,
+        headers={
+            "X-API-Key": "sk_test",
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        },
+    )
+
+
+def test_gzip_body_is_decompressed(client):
+    response = _post_gzip(client, gzip.compress(json.dumps({"logs": LOGS}).encode()))
+
+    assert response.status_code == 200
+    assert response.json()["processed"] == len(LOGS)
+    assert client.processed == [LOGS]
+
+
+def test_invalid_gzip_body_is_rejected(client):
+    response = _post_gzip(client, b"not gzip at all")
+
+    assert response.status_code == 400
+    assert client.processed == []
+
+
+def test_oversized_gzip_body_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(gzip_request, "MAX_DECOMPRESSED_BYTES", 64)
+
+    response = _post_gzip(client, gzip.compress(json.dumps({"logs": LOGS}).encode()))
+
+    assert response.status_code == 413
+    assert client.processed == []
+
+
+def test_truncated_gzip_body_fails_validation(client):
+    body = gzip.compress(json.dumps({"logs": LOGS}).encode())
+
+    response = _post_gzip(client, body[: len(body) // 2])
+
+    assert response.status_code == 422
+    assert client.processed == []